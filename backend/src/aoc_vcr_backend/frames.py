@@ -0,0 +1,241 @@
+"""Reconstruction of delta-encoded snapshot values into full frames."""
+
+import base64
+import sys
+from array import array
+from typing import Any, Iterator
+
+
+TYPECODES = {"int32": "i", "int64": "q", "float64": "d"}
+INT32_MIN = -(2**31)
+INT32_MAX = 2**31 - 1
+DTYPES = {typecode: dtype for dtype, typecode in TYPECODES.items()}
+
+
+class GraphState:
+    """Accumulated state of a delta-encoded graph."""
+
+    def __init__(self) -> None:
+        self.nodes: list[Any] = []
+        self.present: set[int] = set()
+        self.edges: set[tuple[int, int]] = set()
+        self.state: dict[str, dict[int, Any]] = {}
+
+    def apply(self, delta: dict[str, Any]) -> None:
+        """Apply one graph delta frame."""
+        first_new = len(self.nodes)
+        self.nodes.extend(delta["intern"])
+        self.present.update(range(first_new, len(self.nodes)))
+        self.present.update(delta["nodes_added"])
+        self.present.difference_update(delta["nodes_removed"])
+
+        added = delta["edges_added"]
+        self.edges.update(zip(added[0::2], added[1::2]))
+        removed = delta["edges_removed"]
+        self.edges.difference_update(zip(removed[0::2], removed[1::2]))
+
+        for name, changes in delta["state"].items():
+            values = self.state.setdefault(name, {})
+            for node_id in changes["unset"]:
+                values.pop(node_id, None)
+            for node_id, value in changes["set"]:
+                values[node_id] = value
+
+    def materialize(self) -> dict[str, Any]:
+        """Return the graph in the full (non-delta) serialization format."""
+        nodes = self.nodes
+        return {
+            "type": "graph",
+            "nodes": [nodes[i] for i in sorted(self.present)],
+            "edges": [[nodes[a], nodes[b]] for a, b in self.edges],
+            "state": {
+                name: [[nodes[i], value] for i, value in values.items()]
+                for name, values in self.state.items()
+            },
+        }
+
+
+def decode_array(block: dict[str, Any]) -> array:
+    """Decode a little-endian base64 typed array block."""
+    values = array(TYPECODES[block["dtype"]])
+    values.frombytes(base64.b64decode(block["data"]))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def encode_array(values: array) -> dict[str, Any]:
+    """Encode a typed array as a little-endian base64 block."""
+    dtype = DTYPES[values.typecode]
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return {"dtype": dtype, "data": base64.b64encode(values.tobytes()).decode("ascii")}
+
+
+class PointsState:
+    """Accumulated state of a point set sent as packed frames and deltas."""
+
+    def __init__(self, packed: dict[str, Any]) -> None:
+        # Decoded lazily, since most packed frames are not followed by a delta
+        self.packed: dict[str, Any] | None = packed
+        self.dim: int = packed["dim"]
+        self.points: set[tuple] = set()
+
+    def _unpack(self, block: dict[str, Any]) -> set[tuple]:
+        values = decode_array(block)
+        return set(zip(*[iter(values)] * self.dim))
+
+    def apply(self, delta: dict[str, Any]) -> None:
+        """Apply one points delta frame."""
+        if self.packed is not None:
+            self.points = self._unpack(self.packed)
+            self.packed = None
+        self.points -= self._unpack(delta["removed"])
+        self.points |= self._unpack(delta["added"])
+
+    def materialize(self) -> dict[str, Any]:
+        """Return the points in the full packed serialization format."""
+        if self.packed is not None:
+            return self.packed
+
+        dim = self.dim
+        flat = [x for point in self.points for x in point]
+        if not all(isinstance(x, int) for x in flat):
+            values = array("d", flat)
+        elif all(INT32_MIN <= x <= INT32_MAX for x in flat):
+            values = array("i", flat)
+        else:
+            values = array("q", flat)
+        return {
+            "type": "points",
+            "encoding": "packed",
+            "dim": dim,
+            "count": len(self.points),
+            **encode_array(values),
+            "bounds": {
+                "min": [min(values[d::dim], default=0) for d in range(dim)],
+                "max": [max(values[d::dim], default=0) for d in range(dim)],
+            },
+        }
+
+
+def is_graph_delta(value: Any) -> bool:
+    """Check if value is a delta-encoded graph."""
+    return (
+        isinstance(value, dict)
+        and value.get("type") == "graph"
+        and value.get("encoding") == "delta"
+    )
+
+
+def is_packed_points(value: Any) -> bool:
+    """Check if value is a packed or delta-encoded point collection."""
+    return (
+        isinstance(value, dict)
+        and value.get("type") == "points"
+        and value.get("encoding") in ("packed", "delta")
+    )
+
+
+def is_delta(value: Any) -> bool:
+    """Check if value builds on an earlier frame (a non-keyframe delta)."""
+    return (
+        isinstance(value, dict)
+        and value.get("encoding") == "delta"
+        and not value.get("keyframe", False)
+    )
+
+
+def fold_start(events: list[dict[str, Any]], iteration: int) -> int:
+    """Index of the earliest event needed to materialize events[iteration].
+
+    Each delta-encoded key is walked back to its own latest keyframe (or
+    packed frame), skipping events that omit the key.
+    """
+    start = iteration
+    for key, value in events[iteration]["data"].items():
+        index = iteration
+        while index > 0 and is_delta(value):
+            index -= 1
+            value = events[index]["data"].get(key, value)
+        start = min(start, index)
+    return start
+
+
+class DeltaState:
+    """Delta-encoded values of a run, folded up to the last applied event.
+
+    A delta whose "base" is not the last frame applied for its key means an
+    event was lost. That value is unavailable (materialized as None) until
+    its next keyframe.
+    """
+
+    def __init__(self) -> None:
+        self.graphs: dict[str, GraphState] = {}
+        self.points: dict[str, PointsState] = {}
+        self.last_iteration: dict[str, int | None] = {}
+
+    def _follows(self, key: str, value: dict[str, Any], states: dict[str, Any]) -> bool:
+        if key in states and value.get("base") == self.last_iteration.get(key):
+            return True
+        states.pop(key, None)
+        return False
+
+    def apply(self, event: dict[str, Any]) -> None:
+        """Fold one event's delta-encoded values into the state."""
+        iteration = event.get("client_iteration")
+        for key, value in event["data"].items():
+            if is_graph_delta(value):
+                if value["keyframe"]:
+                    self.graphs[key] = GraphState()
+                elif not self._follows(key, value, self.graphs):
+                    continue
+                self.graphs[key].apply(value)
+            elif is_packed_points(value):
+                if value["encoding"] == "packed":
+                    self.points[key] = PointsState(value)
+                elif not self._follows(key, value, self.points):
+                    continue
+                else:
+                    self.points[key].apply(value)
+            else:
+                continue
+            self.last_iteration[key] = iteration
+
+    def materialize(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Replace the delta-encoded values of the last applied event with full values."""
+        full = {}
+        for key, value in data.items():
+            if is_graph_delta(value):
+                graph = self.graphs.get(key)
+                full[key] = graph.materialize() if graph else None
+            elif is_packed_points(value):
+                points = self.points.get(key)
+                full[key] = points.materialize() if points else None
+            else:
+                full[key] = value
+        return full
+
+
+def materialize_events(events: list[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    """Yield each event with delta-encoded values replaced by full values.
+
+    Deltas are folded in order, so events must start at iteration 0.
+    """
+    state = DeltaState()
+    for event in events:
+        state.apply(event)
+        yield {**event, "data": state.materialize(event["data"])}
+
+
+def materialize_event(events: list[dict[str, Any]], iteration: int) -> dict[str, Any]:
+    """Reconstruct a single event, materializing only that frame.
+
+    Folding starts at the earliest keyframe any of its values builds on.
+    """
+    state = DeltaState()
+    for event in events[fold_start(events, iteration) : iteration + 1]:
+        state.apply(event)
+    event = events[iteration]
+    return {**event, "data": state.materialize(event["data"])}
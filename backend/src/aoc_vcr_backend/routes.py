@@ -3,12 +3,14 @@
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from . import frames
 from . import storage
 from . import streaming
+from . import timings
 
 
 router = APIRouter()
@@ -24,8 +26,25 @@ class CreateRunResponse(BaseModel):
     run_id: str
 
 
+INT64_MAX = 2**63 - 1
+
+
+class Timing(BaseModel):
+    solver_ns: int = Field(0, ge=0, le=INT64_MAX)
+    serialize_ns: int = Field(0, ge=0, le=INT64_MAX)
+    prev_send_ns: int = Field(0, ge=0, le=INT64_MAX)
+
+
+class FinishRequest(BaseModel):
+    total_iterations: int | None = None
+    last_send_ns: int = Field(0, ge=0, le=INT64_MAX)
+
+
 class EventRequest(BaseModel):
     data: dict[str, Any]
+    iteration: int | None = None
+    timestamp: str | None = None
+    timing: Timing | None = None
 
 
 @router.post("/runs", response_model=CreateRunResponse)
@@ -44,7 +63,13 @@ async def create_run(request: CreateRunRequest) -> CreateRunResponse:
 @router.post("/runs/{run_id}/events")
 async def add_event(run_id: str, request: EventRequest) -> dict[str, Any]:
     """Add a state snapshot to a run."""
-    event = storage.add_event(run_id, request.data)
+    event = storage.add_event(
+        run_id,
+        request.data,
+        client_iteration=request.iteration,
+        client_timestamp=request.timestamp,
+        timing=request.timing.model_dump() if request.timing else None,
+    )
     if event is None:
         raise HTTPException(status_code=404, detail="Run not found or already finished")
 
@@ -55,9 +80,13 @@ async def add_event(run_id: str, request: EventRequest) -> dict[str, Any]:
 
 
 @router.post("/runs/{run_id}/finish")
-async def finish_run(run_id: str) -> dict[str, Any]:
+async def finish_run(run_id: str, request: FinishRequest | None = None) -> dict[str, Any]:
     """Mark a run as complete."""
-    finish_event = storage.finish_run(run_id)
+    finish_event = storage.finish_run(
+        run_id,
+        last_send_ns=request.last_send_ns if request else 0,
+        total_iterations=request.total_iterations if request else None,
+    )
     if finish_event is None:
         raise HTTPException(status_code=404, detail="Run not found or already finished")
 
@@ -97,6 +126,26 @@ async def get_run(run_id: str) -> dict[str, Any]:
     return run_data
 
 
+@router.get("/runs/{run_id}/frames/{iteration}")
+async def get_frame(run_id: str, iteration: int) -> dict[str, Any]:
+    """Get a single event with delta-encoded values reconstructed."""
+    run = storage.get_run_state(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    if not 0 <= iteration < len(run.events):
+        raise HTTPException(status_code=404, detail="Frame not found")
+
+    return frames.materialize_event(run.events, iteration)
+
+
+@router.get("/runs/{run_id}/timings")
+async def get_timings(run_id: str, buckets: int | None = Query(None, ge=1)) -> dict[str, Any]:
+    """Get per-frame solver and serialize cost series for a run."""
+    if not storage.run_file_path(run_id).exists():
+        raise HTTPException(status_code=404, detail="Run not found")
+    return timings.cost_series(run_id, buckets)
+
+
 @router.get("/runs")
 async def list_runs() -> list[dict[str, Any]]:
     """List all runs."""
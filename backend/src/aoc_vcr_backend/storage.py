@@ -1,6 +1,11 @@
-"""JSONL persistence for runs."""
+"""JSONL persistence for runs.
+
+Per-snapshot timings are kept out of the event log, in a side file of
+fixed-size binary records (see append_timing).
+"""
 
 import json
+import struct
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
@@ -10,6 +15,10 @@ import asyncio
 
 RUNS_DIR = Path("./runs")
 
+# (iteration, solver_ns, serialize_ns, send_ns), little-endian int64.
+# Records are additive: an iteration's costs are the sum of its records.
+TIMING_RECORD = struct.Struct("<qqqq")
+
 
 @dataclass
 class RunState:
@@ -35,6 +44,51 @@ def run_file_path(run_id: str) -> Path:
     return RUNS_DIR / f"{run_id}.jsonl"
 
 
+def timings_file_path(run_id: str) -> Path:
+    """Get the timings side file path for a run."""
+    return RUNS_DIR / f"{run_id}.timings"
+
+
+def append_timing(
+    run_id: str, iteration: int, timing: dict[str, int], follows_previous: bool = False
+) -> None:
+    """Append timing records to a run's side file.
+
+    The client only knows how long sending an event took once it is sent,
+    so prev_send_ns (the previous client event's send time) is recorded
+    against the previous iteration. That is only the same event if
+    follows_previous is set; otherwise it was lost and its send time is
+    dropped.
+    """
+    records = TIMING_RECORD.pack(
+        iteration, timing.get("solver_ns", 0), timing.get("serialize_ns", 0), 0
+    )
+    if timing.get("prev_send_ns") and follows_previous:
+        records += TIMING_RECORD.pack(iteration - 1, 0, 0, timing["prev_send_ns"])
+    _append_timing_records(run_id, records)
+
+
+def append_send_timing(run_id: str, iteration: int, send_ns: int) -> None:
+    """Record the time the client spent sending an event."""
+    _append_timing_records(run_id, TIMING_RECORD.pack(iteration, 0, 0, send_ns))
+
+
+def _append_timing_records(run_id: str, records: bytes) -> None:
+    ensure_runs_dir()
+    with open(timings_file_path(run_id), "ab") as f:
+        f.write(records)
+
+
+def read_timings(run_id: str) -> list[tuple[int, int, int, int]]:
+    """Read all (iteration, solver_ns, serialize_ns, send_ns) records for a run."""
+    path = timings_file_path(run_id)
+    if not path.exists():
+        return []
+    data = path.read_bytes()
+    usable = len(data) - len(data) % TIMING_RECORD.size
+    return list(TIMING_RECORD.iter_unpack(data[:usable]))
+
+
 def append_to_run(run_id: str, data: dict[str, Any]) -> None:
     """Append a JSON line to a run file."""
     ensure_runs_dir()
@@ -99,7 +153,8 @@ def list_runs() -> list[dict[str, Any]]:
 
 
 def delete_run(run_id: str) -> bool:
-    """Delete a run file."""
+    """Delete a run file and its timings."""
+    timings_file_path(run_id).unlink(missing_ok=True)
     path = run_file_path(run_id)
     if path.exists():
         path.unlink()
@@ -126,8 +181,19 @@ def create_run(run_id: str, day: int, part: int, input_hash: str | None = None)
     return metadata
 
 
-def add_event(run_id: str, data: dict[str, Any]) -> dict[str, Any] | None:
-    """Add an event to a run."""
+def add_event(
+    run_id: str,
+    data: dict[str, Any],
+    client_iteration: int | None = None,
+    client_timestamp: str | None = None,
+    timing: dict[str, int] | None = None,
+) -> dict[str, Any] | None:
+    """Add an event to a run.
+
+    The client's iteration and timestamp are kept alongside the server's;
+    delta-encoded values refer to client iterations. Timings go to the side
+    file rather than the event log.
+    """
     run = active_runs.get(run_id)
     if run is None:
         # Try to load from disk
@@ -151,15 +217,34 @@ def add_event(run_id: str, data: dict[str, Any]) -> dict[str, Any] | None:
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "data": data,
     }
-
+    if client_iteration is not None:
+        event["client_iteration"] = client_iteration
+    if client_timestamp is not None:
+        event["client_timestamp"] = client_timestamp
+
+    # Timing first: if it fails, nothing has been written for this event
+    if timing is not None:
+        follows_previous = (
+            bool(run.events)
+            and client_iteration is not None
+            and run.events[-1].get("client_iteration") == client_iteration - 1
+        )
+        append_timing(run_id, iteration, timing, follows_previous)
     append_to_run(run_id, event)
     run.events.append(event)
 
     return event
 
 
-def finish_run(run_id: str) -> dict[str, Any] | None:
-    """Mark a run as finished."""
+def finish_run(
+    run_id: str, last_send_ns: int = 0, total_iterations: int | None = None
+) -> dict[str, Any] | None:
+    """Mark a run as finished.
+
+    last_send_ns is the time the client spent sending its last event. It is
+    recorded only if that event, iteration total_iterations - 1 on the
+    client, is the last one stored.
+    """
     run = active_runs.get(run_id)
     if run is None:
         return None
@@ -173,6 +258,13 @@ def finish_run(run_id: str) -> dict[str, Any] | None:
         "total_iterations": len(run.events),
     }
 
+    if (
+        last_send_ns
+        and run.events
+        and total_iterations is not None
+        and run.events[-1].get("client_iteration") == total_iterations - 1
+    ):
+        append_send_timing(run_id, len(run.events) - 1, last_send_ns)
     append_to_run(run_id, finish_event)
     run.finished = True
 
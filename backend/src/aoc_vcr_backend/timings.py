@@ -0,0 +1,52 @@
+"""Aggregation of per-snapshot timings into cost series."""
+
+from typing import Any
+
+from . import storage
+
+
+def cost_series(run_id: str, buckets: int | None = None) -> dict[str, Any]:
+    """Build per-frame solver, serialize and send cost series for a run.
+
+    send_ns is the client's time spent JSON-encoding and POSTing the event.
+    With buckets, consecutive frames are summed into at most that many
+    buckets, e.g. to match the pixel width of a timeline.
+    """
+    costs: dict[int, list[int]] = {}
+    for iteration, solver, serialize, send in storage.read_timings(run_id):
+        frame = costs.setdefault(iteration, [0, 0, 0])
+        frame[0] += solver
+        frame[1] += serialize
+        frame[2] += send
+    frames = sorted(costs.items())
+
+    count = len(frames)
+    bucket_size = 1
+    if buckets and count > buckets:
+        bucket_size = -(-count // buckets)
+
+    iterations = []
+    solver_ns = []
+    serialize_ns = []
+    send_ns = []
+    for start in range(0, count, bucket_size):
+        chunk = frames[start : start + bucket_size]
+        iterations.append(chunk[0][0])
+        solver_ns.append(sum(c[0] for _, c in chunk))
+        serialize_ns.append(sum(c[1] for _, c in chunk))
+        send_ns.append(sum(c[2] for _, c in chunk))
+
+    return {
+        "frames": count,
+        "bucket_size": bucket_size,
+        "iterations": iterations,
+        "solver_ns": solver_ns,
+        "serialize_ns": serialize_ns,
+        "send_ns": send_ns,
+        "totals": {
+            "solver_ns": sum(solver_ns),
+            "serialize_ns": sum(serialize_ns),
+            "send_ns": sum(send_ns),
+            "max_frame_ns": max((sum(c) for _, c in frames), default=0),
+        },
+    }
@@ -1,6 +1,9 @@
+import { FrameDecoder } from './decoder.js';
 import { Player } from './player.js';
+import { GraphRenderer } from './renderers/graph.js';
 import { GridRenderer } from './renderers/grid.js';
 import { PointsRenderer } from './renderers/points.js';
+import { Timeline, formatNs } from './timeline.js';
 
 const API_BASE = 'http://localhost:8000';
 
@@ -9,10 +12,17 @@ class App {
         this.player = null;
         this.currentRun = null;
         this.eventSource = null;
+        this.decoder = new FrameDecoder();
+        this.timingsLoading = null;
+        this.timingsStale = false;
 
         this.canvas = document.getElementById('vcr-canvas');
         this.gridRenderer = new GridRenderer(this.canvas);
         this.pointsRenderer = new PointsRenderer(this.canvas);
+        this.graphRenderer = new GraphRenderer(this.canvas);
+        this.timeline = new Timeline(document.getElementById('timeline'), {
+            onSeek: (index) => this.player?.seek(index)
+        });
 
         this.initElements();
         this.initEventListeners();
@@ -26,6 +36,7 @@ class App {
         this.frameCounter = document.getElementById('frame-counter');
         this.speedSelect = document.getElementById('speed-select');
         this.stateData = document.getElementById('state-data');
+        this.timelineSummary = document.getElementById('timeline-summary');
 
         this.btnFirst = document.getElementById('btn-first');
         this.btnPrev = document.getElementById('btn-prev');
@@ -147,10 +158,60 @@ class App {
         } catch (err) {
             console.error('Failed to load run:', err);
         }
+
+        this.refreshTimings();
+    }
+
+    // Reload the current run's timings. Live runs call this on every event,
+    // so at most one request is in flight, with one more queued behind it.
+    refreshTimings() {
+        if (this.timingsLoading) {
+            this.timingsStale = true;
+            return;
+        }
+        const runId = this.currentRun?.metadata.run_id;
+        if (!runId) return;
+
+        this.timingsLoading = this.loadTimings(runId).finally(() => {
+            this.timingsLoading = null;
+            if (this.timingsStale) {
+                this.timingsStale = false;
+                this.refreshTimings();
+            }
+        });
+    }
+
+    async loadTimings(runId) {
+        try {
+            const buckets = this.timeline.bucketCount();
+            const response = await fetch(`${API_BASE}/runs/${runId}/timings?buckets=${buckets}`);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            const series = await response.json();
+            // Another run may have been selected meanwhile
+            if (this.currentRun?.metadata.run_id !== runId) return;
+            this.timeline.setSeries(series);
+
+            const { solver_ns, serialize_ns, send_ns } = series.totals;
+            const recording = serialize_ns + send_ns;
+            const total = solver_ns + recording;
+            const share = total > 0 ? (100 * recording / total).toFixed(1) : '0.0';
+            this.timelineSummary.textContent =
+                `solver ${formatNs(solver_ns)} • serialize ${formatNs(serialize_ns)}` +
+                ` • send ${formatNs(send_ns)} (recording ${share}%)`;
+        } catch (err) {
+            console.error('Failed to load timings:', err);
+            if (this.currentRun?.metadata.run_id === runId) {
+                this.timeline.setSeries(null);
+                this.timelineSummary.textContent = '';
+            }
+        }
     }
 
     loadRun(run) {
         this.currentRun = run;
+        this.decoder.reset();
 
         // Update header info
         const meta = run.metadata;
@@ -175,11 +236,12 @@ class App {
     }
 
     renderFrame(frame, index) {
-        const data = frame.data;
+        const data = this.decoder.decode(this.currentRun.events, index);
 
         // Update seek bar and counter
         this.seekBar.value = index;
         this.frameCounter.textContent = `Frame: ${index + 1}/${this.currentRun.events.length}`;
+        this.timeline.setFrame(index);
 
         // Render visualization based on data type
         let rendered = false;
@@ -194,6 +256,10 @@ class App {
                     this.pointsRenderer.render(value);
                     rendered = true;
                     break;
+                } else if (value.type === 'graph') {
+                    this.graphRenderer.render(value);
+                    rendered = true;
+                    break;
                 }
             }
         }
@@ -230,12 +296,14 @@ class App {
                 if (this.player?.isPlaying() || this.seekBar.value == this.seekBar.max - 1) {
                     this.player?.last();
                 }
+                this.refreshTimings();
             }
         });
 
         this.eventSource.addEventListener('finish', (e) => {
             const data = JSON.parse(e.data);
             this.runInfo.textContent = this.runInfo.textContent.replace('Live', `${data.total_iterations} frames`);
+            this.refreshTimings();
         });
 
         this.eventSource.onerror = () => {
@@ -0,0 +1,232 @@
+import { decodePacked } from './renderers/points.js';
+
+// Reconstructs full frame data from delta-encoded events.
+//
+// Deltas are folded forward from the last decoded frame; seeking backwards
+// replays from the start of the run.
+
+class GraphState {
+    constructor() {
+        this.nodes = [];
+        this.present = new Set();
+        this.edges = new Map();
+        this.state = {};
+    }
+
+    apply(delta) {
+        const firstNew = this.nodes.length;
+        for (const node of delta.intern) {
+            this.nodes.push(node);
+        }
+        for (let id = firstNew; id < this.nodes.length; id++) {
+            this.present.add(id);
+        }
+        for (const id of delta.nodes_added) this.present.add(id);
+        for (const id of delta.nodes_removed) this.present.delete(id);
+
+        const added = delta.edges_added;
+        for (let i = 0; i < added.length; i += 2) {
+            this.edges.set(`${added[i]},${added[i + 1]}`, [added[i], added[i + 1]]);
+        }
+        const removed = delta.edges_removed;
+        for (let i = 0; i < removed.length; i += 2) {
+            this.edges.delete(`${removed[i]},${removed[i + 1]}`);
+        }
+
+        for (const [name, changes] of Object.entries(delta.state)) {
+            const values = this.state[name] || (this.state[name] = new Map());
+            for (const id of changes.unset) values.delete(id);
+            for (const [id, value] of changes.set) values.set(id, value);
+        }
+    }
+
+    view() {
+        return {
+            type: 'graph',
+            nodes: this.nodes,
+            present: this.present,
+            edges: this.edges,
+            state: this.state
+        };
+    }
+}
+
+// 2D integer coordinates below this magnitude pack exactly into one number
+const KEY_RANGE = 2 ** 25;
+
+// A point set kept as a flat Float64Array plus a map from point key to slot,
+// so deltas update the array in place.
+class PointsState {
+    constructor(packed) {
+        // Decoded lazily, since most packed frames are not followed by a delta
+        this.packed = packed;
+        this.dim = packed.dim;
+        this.values = null;
+        this.count = 0;
+        this.slots = new Map();
+    }
+
+    keyAt(values, i) {
+        if (this.dim === 2) {
+            const x = values[i];
+            const y = values[i + 1];
+            if (Number.isInteger(x) && Number.isInteger(y) &&
+                Math.abs(x) < KEY_RANGE && Math.abs(y) < KEY_RANGE) {
+                return (x + KEY_RANGE) * 2 * KEY_RANGE + (y + KEY_RANGE);
+            }
+        } else if (this.dim === 1) {
+            return values[i];
+        }
+        return values.subarray(i, i + this.dim).join(',');
+    }
+
+    add(src, i) {
+        const key = this.keyAt(src, i);
+        if (this.slots.has(key)) return;
+
+        const dim = this.dim;
+        if ((this.count + 1) * dim > this.values.length) {
+            const grown = new Float64Array(Math.max(dim, this.values.length * 2));
+            grown.set(this.values);
+            this.values = grown;
+        }
+        for (let d = 0; d < dim; d++) {
+            this.values[this.count * dim + d] = src[i + d];
+        }
+        this.slots.set(key, this.count++);
+    }
+
+    // Move the last point into the removed point's slot
+    remove(src, i) {
+        const key = this.keyAt(src, i);
+        const slot = this.slots.get(key);
+        if (slot === undefined) return;
+
+        const dim = this.dim;
+        const last = --this.count;
+        this.slots.delete(key);
+        if (slot !== last) {
+            this.values.copyWithin(slot * dim, last * dim, (last + 1) * dim);
+            this.slots.set(this.keyAt(this.values, slot * dim), slot);
+        }
+    }
+
+    apply(delta) {
+        const dim = this.dim;
+        if (this.packed) {
+            const initial = decodePacked(this.packed);
+            this.values = new Float64Array(Math.max(dim, initial.length));
+            for (let i = 0; i < initial.length; i += dim) this.add(initial, i);
+            this.packed = null;
+        }
+        const removed = decodePacked(delta.removed);
+        for (let i = 0; i < removed.length; i += dim) this.remove(removed, i);
+        const added = decodePacked(delta.added);
+        for (let i = 0; i < added.length; i += dim) this.add(added, i);
+    }
+
+    view() {
+        return {
+            type: 'points',
+            dim: this.dim,
+            values: this.values.subarray(0, this.count * this.dim)
+        };
+    }
+}
+
+function isPointsDelta(value) {
+    return value && value.type === 'points' && value.encoding === 'delta';
+}
+
+function isGraphDelta(value) {
+    return value && value.type === 'graph' && value.encoding === 'delta';
+}
+
+// A delta that builds on an earlier frame (as opposed to a keyframe)
+function isDelta(value) {
+    return value && value.encoding === 'delta' && !value.keyframe;
+}
+
+// Index of the earliest event needed to decode events[index]: each delta
+// key is walked back to its own keyframe, skipping events that omit it.
+function foldStart(events, index) {
+    let start = index;
+    for (const [key, initial] of Object.entries(events[index].data)) {
+        let value = initial;
+        let i = index;
+        while (i > 0 && isDelta(value)) {
+            i--;
+            if (key in events[i].data) value = events[i].data[key];
+        }
+        start = Math.min(start, i);
+    }
+    return start;
+}
+
+// A delta whose base is not the last frame applied for its key means an
+// event was lost; that value decodes as null until its next keyframe.
+export class FrameDecoder {
+    constructor() {
+        this.reset();
+    }
+
+    reset() {
+        this.index = -1;
+        this.graphs = {};
+        this.points = {};
+        this.lastIteration = {};
+    }
+
+    decode(events, index) {
+        const start = foldStart(events, index);
+        if (index < this.index || start > this.index) {
+            this.reset();
+            this.index = start - 1;
+        }
+        for (let i = this.index + 1; i <= index; i++) {
+            this.apply(events[i]);
+        }
+        this.index = index;
+
+        const data = {};
+        for (const [key, value] of Object.entries(events[index].data)) {
+            if (isGraphDelta(value)) {
+                data[key] = this.graphs[key]?.view() ?? null;
+            } else if (isPointsDelta(value)) {
+                data[key] = this.points[key]?.view() ?? null;
+            } else {
+                data[key] = value;
+            }
+        }
+        return data;
+    }
+
+    follows(key, value, states) {
+        if (states[key] && value.base === this.lastIteration[key]) {
+            return true;
+        }
+        delete states[key];
+        return false;
+    }
+
+    apply(event) {
+        for (const [key, value] of Object.entries(event.data)) {
+            if (isGraphDelta(value)) {
+                if (value.keyframe) {
+                    this.graphs[key] = new GraphState();
+                } else if (!this.follows(key, value, this.graphs)) {
+                    continue;
+                }
+                this.graphs[key].apply(value);
+            } else if (value && value.type === 'points' && value.encoding === 'packed') {
+                this.points[key] = new PointsState(value);
+            } else if (isPointsDelta(value)) {
+                if (!this.follows(key, value, this.points)) continue;
+                this.points[key].apply(value);
+            } else {
+                continue;
+            }
+            this.lastIteration[key] = event.client_iteration;
+        }
+    }
+}
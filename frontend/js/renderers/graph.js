@@ -0,0 +1,166 @@
+export class GraphRenderer {
+    constructor(canvas) {
+        this.canvas = canvas;
+        this.ctx = canvas.getContext('2d');
+
+        this.nodeColor = '#95a5a6';
+        this.edgeColor = 'rgba(149, 165, 166, 0.35)';
+        this.highlightColor = '#e74c3c';
+        this.backgroundColor = '#1a1a2e';
+        this.maxEdges = 50000;
+    }
+
+    // Accepts the view produced by FrameDecoder (node table + ID sets) or the
+    // full format with raw node values.
+    render(graphData, options = {}) {
+        const view = graphData.present ? graphData : this.fromFull(graphData);
+        const { nodes, present, edges, state } = view;
+
+        if (present.size === 0) {
+            this.clear();
+            return;
+        }
+
+        const container = this.canvas.parentElement;
+        this.canvas.width = container.clientWidth - 20;
+        this.canvas.height = container.clientHeight - 20;
+
+        const positions = this.layout(nodes, present);
+        const radius = Math.max(1, Math.min(6, 400 / Math.sqrt(present.size)));
+
+        this.ctx.fillStyle = this.backgroundColor;
+        this.ctx.fillRect(0, 0, this.canvas.width, this.canvas.height);
+
+        // Draw edges
+        if (edges.size <= this.maxEdges) {
+            this.ctx.strokeStyle = this.edgeColor;
+            this.ctx.lineWidth = 1;
+            this.ctx.beginPath();
+            for (const [a, b] of edges.values()) {
+                const pa = positions.get(a);
+                const pb = positions.get(b);
+                if (!pa || !pb) continue;
+                this.ctx.moveTo(pa[0], pa[1]);
+                this.ctx.lineTo(pb[0], pb[1]);
+            }
+            this.ctx.stroke();
+        }
+
+        // Draw nodes, coloured by the first state entry
+        const [stateValues] = Object.values(state);
+        const colorFor = this.colorScale(stateValues);
+        for (const id of present) {
+            const [x, y] = positions.get(id);
+            this.ctx.fillStyle = colorFor(stateValues?.get(id));
+            this.ctx.fillRect(x - radius, y - radius, radius * 2, radius * 2);
+        }
+    }
+
+    // Nodes that are [x, y] pairs are placed by coordinate; anything else is
+    // laid out in ID order on a square lattice.
+    layout(nodes, present) {
+        const positions = new Map();
+        const padding = 10;
+        const width = this.canvas.width - padding * 2;
+        const height = this.canvas.height - padding * 2;
+
+        const isCoordinate = (node) => Array.isArray(node) && node.length === 2 &&
+            typeof node[0] === 'number' && typeof node[1] === 'number';
+
+        let allCoordinates = true;
+        let minA = Infinity, maxA = -Infinity, minB = Infinity, maxB = -Infinity;
+        for (const id of present) {
+            const node = nodes[id];
+            if (!isCoordinate(node)) {
+                allCoordinates = false;
+                break;
+            }
+            minA = Math.min(minA, node[0]);
+            maxA = Math.max(maxA, node[0]);
+            minB = Math.min(minB, node[1]);
+            maxB = Math.max(maxB, node[1]);
+        }
+
+        if (allCoordinates) {
+            // (row, col) convention, matching the grid renderer
+            const scale = Math.min(width / (maxB - minB + 1), height / (maxA - minA + 1));
+            for (const id of present) {
+                const [a, b] = nodes[id];
+                positions.set(id, [
+                    padding + (b - minB + 0.5) * scale,
+                    padding + (a - minA + 0.5) * scale
+                ]);
+            }
+            return positions;
+        }
+
+        const ids = [...present].sort((a, b) => a - b);
+        const cols = Math.ceil(Math.sqrt(ids.length * width / height));
+        const rows = Math.ceil(ids.length / cols);
+        const cell = Math.min(width / cols, height / rows);
+        ids.forEach((id, i) => {
+            positions.set(id, [
+                padding + (i % cols + 0.5) * cell,
+                padding + (Math.floor(i / cols) + 0.5) * cell
+            ]);
+        });
+        return positions;
+    }
+
+    // Numeric state is shown as a heat scale; any other value as a highlight.
+    colorScale(values) {
+        if (!values || values.size === 0) {
+            return () => this.nodeColor;
+        }
+
+        let min = Infinity, max = -Infinity;
+        for (const value of values.values()) {
+            if (typeof value === 'number') {
+                min = Math.min(min, value);
+                max = Math.max(max, value);
+            }
+        }
+
+        return (value) => {
+            if (value === undefined || value === null || value === false) {
+                return this.nodeColor;
+            }
+            if (typeof value !== 'number' || min === max) {
+                return this.highlightColor;
+            }
+            const t = (value - min) / (max - min);
+            return `hsl(${Math.round(240 * (1 - t))}, 70%, 55%)`;
+        };
+    }
+
+    fromFull(graphData) {
+        const index = new Map();
+        const nodes = [];
+        const idOf = (node) => {
+            const key = JSON.stringify(node);
+            if (!index.has(key)) {
+                index.set(key, nodes.length);
+                nodes.push(node);
+            }
+            return index.get(key);
+        };
+
+        const present = new Set(graphData.nodes.map(idOf));
+        const edges = new Map();
+        for (const [u, v] of graphData.edges) {
+            const a = idOf(u);
+            const b = idOf(v);
+            edges.set(`${a},${b}`, [a, b]);
+        }
+        const state = {};
+        for (const [name, pairs] of Object.entries(graphData.state || {})) {
+            state[name] = new Map(pairs.map(([node, value]) => [idOf(node), value]));
+        }
+        return { nodes, present, edges, state };
+    }
+
+    clear() {
+        this.ctx.fillStyle = this.backgroundColor;
+        this.ctx.fillRect(0, 0, this.canvas.width, this.canvas.height);
+    }
+}
@@ -1,3 +1,32 @@
+// Decode a base64 little-endian block ({dtype, data}) into a typed array.
+export function decodePacked(block) {
+    const binary = atob(block.data);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    if (block.dtype === 'int32') return new Int32Array(bytes.buffer);
+    if (block.dtype === 'int64') {
+        // Rendering only needs doubles; precision beyond 2**53 is not visible
+        return Float64Array.from(new BigInt64Array(bytes.buffer), Number);
+    }
+    return new Float64Array(bytes.buffer);
+}
+
+// Normalise any points format to a flat typed array of x, y, ... values.
+function toValues(pointsData) {
+    if (pointsData.values) {
+        return { values: pointsData.values, dim: pointsData.dim };
+    }
+    if (pointsData.encoding === 'packed') {
+        return { values: decodePacked(pointsData), dim: pointsData.dim };
+    }
+    // Legacy format: list of [x, y] lists
+    const data = pointsData.data || [];
+    const dim = data.length > 0 ? data[0].length : 2;
+    return { values: Float64Array.from(data.flat()), dim };
+}
+
 export class PointsRenderer {
     constructor(canvas) {
         this.canvas = canvas;
@@ -17,9 +46,9 @@ export class PointsRenderer {
     }
 
     render(pointsData, options = {}) {
-        const { data } = pointsData;
+        const { values, dim } = toValues(pointsData);
 
-        if (!data || data.length === 0) {
+        if (values.length === 0 || dim < 2) {
             this.clear();
             return;
         }
@@ -28,12 +57,18 @@ export class PointsRenderer {
         let minX = Infinity, maxX = -Infinity;
         let minY = Infinity, maxY = -Infinity;
 
-        for (const point of data) {
-            const [x, y] = point;
-            minX = Math.min(minX, x);
-            maxX = Math.max(maxX, x);
-            minY = Math.min(minY, y);
-            maxY = Math.max(maxY, y);
+        if (pointsData.bounds) {
+            [minX, minY] = pointsData.bounds.min;
+            [maxX, maxY] = pointsData.bounds.max;
+        } else {
+            for (let i = 0; i < values.length; i += dim) {
+                const x = values[i];
+                const y = values[i + 1];
+                if (x < minX) minX = x;
+                if (x > maxX) maxX = x;
+                if (y < minY) minY = y;
+                if (y > maxY) maxY = y;
+            }
         }
 
         const width = maxX - minX + 1;
@@ -57,16 +92,21 @@ export class PointsRenderer {
         this.ctx.fillStyle = this.backgroundColor;
         this.ctx.fillRect(0, 0, this.canvas.width, this.canvas.height);
 
-        // Draw points
+        // Draw points; large sets use squares, which are much cheaper than arcs
         this.ctx.fillStyle = this.pointColor;
-        for (const point of data) {
-            const [x, y] = point;
-            const canvasX = (x - minX) * scale + padding;
-            const canvasY = (y - minY) * scale + padding;
-
-            this.ctx.beginPath();
-            this.ctx.arc(canvasX, canvasY, this.pointRadius, 0, Math.PI * 2);
-            this.ctx.fill();
+        const count = values.length / dim;
+        const size = Math.max(1, Math.min(this.pointRadius * 2, scale));
+        for (let i = 0; i < values.length; i += dim) {
+            const canvasX = (values[i] - minX) * scale + padding;
+            const canvasY = (values[i + 1] - minY) * scale + padding;
+
+            if (count > 2000) {
+                this.ctx.fillRect(canvasX - size / 2, canvasY - size / 2, size, size);
+            } else {
+                this.ctx.beginPath();
+                this.ctx.arc(canvasX, canvasY, this.pointRadius, 0, Math.PI * 2);
+                this.ctx.fill();
+            }
         }
     }
 
@@ -0,0 +1,91 @@
+// Per-frame cost timeline: solver time and recorder (serialize, send) time
+// as stacked bars, with a marker at the current frame.
+export class Timeline {
+    constructor(canvas, options = {}) {
+        this.canvas = canvas;
+        this.ctx = canvas.getContext('2d');
+        this.series = null;
+        this.currentIndex = 0;
+
+        this.solverColor = '#3498db';
+        this.serializeColor = '#e94560';
+        this.sendColor = '#9b59b6';
+        this.markerColor = '#f1c40f';
+        this.backgroundColor = '#1a1a2e';
+
+        this.onSeek = options.onSeek || (() => {});
+        this.canvas.addEventListener('click', (e) => this.handleClick(e));
+    }
+
+    // One bucket per pixel is the most the canvas can show
+    bucketCount() {
+        return Math.max(1, this.canvas.clientWidth);
+    }
+
+    // Keeps the current frame: series are reloaded while a run plays
+    setSeries(series) {
+        this.series = series;
+        this.render();
+    }
+
+    setFrame(index) {
+        this.currentIndex = index;
+        this.render();
+    }
+
+    render() {
+        this.canvas.width = this.canvas.clientWidth;
+        const { width, height } = this.canvas;
+
+        this.ctx.fillStyle = this.backgroundColor;
+        this.ctx.fillRect(0, 0, width, height);
+
+        const series = this.series;
+        if (!series || series.iterations.length === 0) return;
+
+        const count = series.iterations.length;
+        const barWidth = width / count;
+        const layers = [
+            [series.solver_ns, this.solverColor],
+            [series.serialize_ns, this.serializeColor],
+            [series.send_ns, this.sendColor]
+        ];
+
+        let max = 0;
+        for (let i = 0; i < count; i++) {
+            max = Math.max(max, layers.reduce((sum, [values]) => sum + values[i], 0));
+        }
+        if (max === 0) return;
+
+        for (let i = 0; i < count; i++) {
+            const x = i * barWidth;
+            let y = height;
+            for (const [values, color] of layers) {
+                const layerHeight = (values[i] / max) * height;
+                y -= layerHeight;
+                this.ctx.fillStyle = color;
+                this.ctx.fillRect(x, y, Math.max(1, barWidth), layerHeight);
+            }
+        }
+
+        const markerX = Math.floor(this.currentIndex / series.bucket_size) * barWidth;
+        this.ctx.fillStyle = this.markerColor;
+        this.ctx.fillRect(markerX, 0, Math.max(1, barWidth), height);
+    }
+
+    handleClick(e) {
+        if (!this.series || this.series.iterations.length === 0) return;
+        const rect = this.canvas.getBoundingClientRect();
+        const bucket = Math.floor(
+            (e.clientX - rect.left) / rect.width * this.series.iterations.length
+        );
+        const clamped = Math.max(0, Math.min(bucket, this.series.iterations.length - 1));
+        this.onSeek(this.series.iterations[clamped]);
+    }
+}
+
+export function formatNs(ns) {
+    if (ns >= 1e9) return `${(ns / 1e9).toFixed(2)}s`;
+    if (ns >= 1e6) return `${(ns / 1e6).toFixed(1)}ms`;
+    return `${(ns / 1e3).toFixed(0)}µs`;
+}
@@ -1,3 +1,5 @@
+from .async_recorder import AsyncRecorder
 from .recorder import Recorder
+from .serializers import Graph
 
-__all__ = ["Recorder"]
+__all__ = ["AsyncRecorder", "Graph", "Recorder"]
@@ -0,0 +1,169 @@
+"""Asyncio-native recorder for solvers running inside an event loop."""
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+import httpx
+
+from .recorder import build_event, hash_input, run_payload
+from .serializers import SnapshotSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRecorder:
+    """Records state snapshots from an async AoC solver.
+
+    Nothing blocks the event loop: the run is created lazily on the first
+    snapshot, and events are sent in order by a background task.
+
+        async with AsyncRecorder(day=4, part=1) as rec:
+            rec.snapshot(grid=grid)
+            await rec.flush()
+    """
+
+    def __init__(
+        self,
+        day: int,
+        part: int,
+        backend_url: str = "http://localhost:8000",
+        input_data: str | None = None,
+        enabled: bool = True,
+        client: httpx.AsyncClient | None = None,
+    ):
+        """Prepare a recorder. No requests are made until the first snapshot.
+
+        Args:
+            day: AoC day number (1-25)
+            part: Part number (1 or 2)
+            backend_url: URL of the visualization backend
+            input_data: Optional input data for hashing
+            enabled: If False, all methods become no-ops
+            client: Optional shared client, e.g. to pool connections across
+                    recorders. It is not closed by the recorder.
+        """
+        self.enabled = enabled
+        self._sender_task: asyncio.Task | None = None
+        if not enabled:
+            return
+
+        self.backend_url = backend_url.rstrip("/")
+        self.day = day
+        self.part = part
+        self.input_hash = hash_input(input_data)
+        self.iteration = 0
+        self.run_id: str | None = None
+        self._serializer = SnapshotSerializer()
+
+        self._queue: asyncio.Queue[dict | None] = asyncio.Queue()
+        self._client = client
+        self._owns_client = client is None
+        self._last_send_ns = 0
+        self._last_snapshot_ns = time.perf_counter_ns()
+
+    async def _create_run(self) -> None:
+        """Create a new run on the backend."""
+        try:
+            response = await self._client.post(
+                f"{self.backend_url}/runs",
+                json=run_payload(self.day, self.part, self.input_hash),
+            )
+            response.raise_for_status()
+            self.run_id = response.json()["run_id"]
+        except Exception as e:
+            logger.warning(f"Failed to create run: {e}")
+            self.enabled = False
+
+    async def _sender(self) -> None:
+        """Background task that creates the run and sends events in order."""
+        await self._create_run()
+
+        while True:
+            event = await self._queue.get()
+            try:
+                if event is None:
+                    return
+                # Drain without sending if the run could not be created
+                if self.run_id is not None:
+                    await self._send(event)
+            finally:
+                self._queue.task_done()
+
+    async def _send(self, event: dict) -> None:
+        """Send one event, timing the encode and POST."""
+        event["timing"]["prev_send_ns"] = self._last_send_ns
+        start = time.perf_counter_ns()
+        try:
+            response = await self._client.post(
+                f"{self.backend_url}/runs/{self.run_id}/events",
+                json=event,
+            )
+            response.raise_for_status()
+        except Exception as e:
+            logger.warning(f"Failed to send event: {e}")
+            # Later deltas build on the lost event; resync with a keyframe
+            self._serializer.request_keyframe()
+        self._last_send_ns = time.perf_counter_ns() - start
+
+    def _start_sender(self) -> None:
+        """Start the background sender on the running event loop."""
+        if self._sender_task is not None:
+            return
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=10.0)
+        self._sender_task = asyncio.get_running_loop().create_task(self._sender())
+
+    def snapshot(self, **state: Any) -> None:
+        """Record a state snapshot. Must be called from the event loop.
+
+        Args:
+            **state: Key-value pairs representing the current state.
+                     Values are serialized exactly as by Recorder.snapshot.
+        """
+        if not self.enabled:
+            return
+
+        solver_ns = time.perf_counter_ns() - self._last_snapshot_ns
+        self._start_sender()
+        self._queue.put_nowait(build_event(self._serializer, self.iteration, state, solver_ns))
+        self.iteration += 1
+        self._last_snapshot_ns = time.perf_counter_ns()
+
+    async def flush(self) -> None:
+        """Wait until all pending events have been sent."""
+        if not self.enabled or self._sender_task is None:
+            return
+        await self._queue.join()
+
+    async def finish(self) -> None:
+        """Mark the run as complete and flush pending events."""
+        if self._sender_task is None:
+            return
+
+        self.enabled = False
+        try:
+            # Snapshots are often queued without yielding to the loop, so most
+            # events may still be pending here. Wait for all of them; each
+            # request is bounded by the client timeout.
+            await self._queue.join()
+            self._queue.put_nowait(None)
+            await self._sender_task
+
+            if self.run_id is not None:
+                await self._client.post(
+                    f"{self.backend_url}/runs/{self.run_id}/finish",
+                    json={"total_iterations": self.iteration, "last_send_ns": self._last_send_ns},
+                )
+        except Exception as e:
+            logger.warning(f"Failed to finish run: {e}")
+        finally:
+            if self._owns_client:
+                await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncRecorder":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.finish()
@@ -4,16 +4,63 @@ import hashlib
 import logging
 import queue
 import threading
+import time
 from datetime import datetime, timezone
 from typing import Any
 
 import httpx
 
-from .serializers import serialize_value
+from .serializers import SnapshotSerializer
 
 logger = logging.getLogger(__name__)
 
 
+def hash_input(input_data: str | None) -> str | None:
+    """Short stable hash of the puzzle input, used to group runs."""
+    if not input_data:
+        return None
+    return hashlib.sha256(input_data.encode()).hexdigest()[:16]
+
+
+def run_payload(day: int, part: int, input_hash: str | None) -> dict:
+    """Body of the request that creates a run."""
+    return {
+        "day": day,
+        "part": part,
+        "input_hash": input_hash,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def build_event(
+    serializer: SnapshotSerializer, iteration: int, state: dict[str, Any], solver_ns: int
+) -> dict:
+    """Serialize a snapshot into the event sent to the backend.
+
+    serialize_ns covers only SnapshotSerializer.serialize. JSON encoding and
+    the POST happen later in the sender, which measures them and reports
+    them on the next event as prev_send_ns (and on finish as last_send_ns).
+    A sender thread also competes with the solver for the GIL, so part of
+    that time can show up in solver_ns as well.
+
+    Args:
+        serializer: The run's serializer
+        iteration: Client-side iteration number
+        state: Snapshot key-value pairs
+        solver_ns: Time spent in the solver since the previous snapshot
+    """
+    start = time.perf_counter_ns()
+    data = serializer.serialize(state, iteration)
+    serialize_ns = time.perf_counter_ns() - start
+
+    return {
+        "iteration": iteration,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "data": data,
+        "timing": {"solver_ns": solver_ns, "serialize_ns": serialize_ns},
+    }
+
+
 class Recorder:
     """Records state snapshots from an AoC solver and sends them to the backend."""
 
@@ -41,32 +88,26 @@ class Recorder:
         self.backend_url = backend_url.rstrip("/")
         self.day = day
         self.part = part
-        self.input_hash = (
-            hashlib.sha256(input_data.encode()).hexdigest()[:16]
-            if input_data
-            else None
-        )
+        self.input_hash = hash_input(input_data)
         self.iteration = 0
         self.run_id: str | None = None
+        self._serializer = SnapshotSerializer()
 
         self._queue: queue.Queue[dict | None] = queue.Queue()
         self._client = httpx.Client(timeout=10.0)
         self._worker_thread: threading.Thread | None = None
         self._started = False
+        self._last_send_ns = 0
 
         self._create_run()
+        self._last_snapshot_ns = time.perf_counter_ns()
 
     def _create_run(self) -> None:
         """Create a new run on the backend."""
         try:
             response = self._client.post(
                 f"{self.backend_url}/runs",
-                json={
-                    "day": self.day,
-                    "part": self.part,
-                    "input_hash": self.input_hash,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                },
+                json=run_payload(self.day, self.part, self.input_hash),
             )
             response.raise_for_status()
             self.run_id = response.json()["run_id"]
@@ -89,34 +130,38 @@ class Recorder:
             event = self._queue.get()
             if event is None:
                 break
+            event["timing"]["prev_send_ns"] = self._last_send_ns
+            start = time.perf_counter_ns()
             try:
-                self._client.post(
+                response = self._client.post(
                     f"{self.backend_url}/runs/{self.run_id}/events",
                     json=event,
                 )
+                response.raise_for_status()
             except Exception as e:
                 logger.warning(f"Failed to send event: {e}")
+                # Later deltas build on the lost event; resync with a keyframe
+                self._serializer.request_keyframe()
+            self._last_send_ns = time.perf_counter_ns() - start
 
     def snapshot(self, **state: Any) -> None:
         """Record a state snapshot.
 
         Args:
             **state: Key-value pairs representing the current state.
-                     Values are auto-serialized based on their type.
+                     Values are auto-serialized based on their type;
+                     graphs and point sets are sent as deltas against
+                     the previous snapshot. The time spent in the solver
+                     since the last snapshot, and in serialization, is
+                     attached to the event.
         """
         if not self.enabled or not self.run_id:
             return
 
-        serialized = {key: serialize_value(value) for key, value in state.items()}
-
-        event = {
-            "iteration": self.iteration,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "data": serialized,
-        }
-
-        self._queue.put(event)
+        solver_ns = time.perf_counter_ns() - self._last_snapshot_ns
+        self._queue.put(build_event(self._serializer, self.iteration, state, solver_ns))
         self.iteration += 1
+        self._last_snapshot_ns = time.perf_counter_ns()
 
     def finish(self) -> None:
         """Mark the run as complete and flush pending events."""
@@ -130,7 +175,7 @@ class Recorder:
         try:
             self._client.post(
                 f"{self.backend_url}/runs/{self.run_id}/finish",
-                json={"total_iterations": self.iteration},
+                json={"total_iterations": self.iteration, "last_send_ns": self._last_send_ns},
             )
         except Exception as e:
             logger.warning(f"Failed to finish run: {e}")
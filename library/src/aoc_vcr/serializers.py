@@ -1,7 +1,42 @@
 """Auto-detection and serialization of common AoC data structures."""
 
+import base64
+import sys
+import threading
+from array import array
+from dataclasses import dataclass, field
+from itertools import chain
 from typing import Any
 
+try:
+    import numpy as np
+except ImportError:  # optional, only needed to record ndarray point sets
+    np = None
+
+INT32_MIN = -(2**31)
+INT32_MAX = 2**31 - 1
+INT64_MAX = 2**63 - 1
+# Largest magnitude up to which every integer is exact as a float64
+FLOAT64_EXACT = 2**53
+
+# Every value is sent in full at least this often, so a lost event only
+# breaks the frames up to the next keyframe
+KEYFRAME_INTERVAL = 100
+
+POINT_TYPES = (set, frozenset, list)
+
+
+@dataclass
+class Graph:
+    """An adjacency list graph with optional per-node state.
+
+    Each entry in node_state maps a state name (e.g. "visited", "dist") to
+    either a dict of node -> value or a set of nodes (recorded as True).
+    """
+
+    adjacency: dict[Any, list]
+    node_state: dict[str, dict | set] = field(default_factory=dict)
+
 
 def is_grid(obj: Any) -> bool:
     """Check if obj is a dict with (int, int) tuple keys."""
@@ -14,21 +49,77 @@ def is_grid(obj: Any) -> bool:
     return True
 
 
-def is_point_collection(obj: Any) -> bool:
-    """Check if obj is a set/list of tuples."""
-    if not isinstance(obj, (set, list)) or not obj:
-        return False
+def flatten_points(obj: Any) -> tuple[Any, int] | None:
+    """Flatten a point collection into a typed array in one pass.
+
+    Accepts a non-empty set/list of equal-length numeric tuples, or an
+    (n, dim) numeric NumPy array. Integer points are stored as int32 or
+    int64, whichever fits, and anything with floats as float64.
+
+    Returns:
+        (values, dim), where values is an array.array or a 1-D ndarray,
+        or None if obj is not a point collection, or cannot be packed
+        exactly (integers beyond int64, or beyond 2**53 mixed with floats).
+    """
+    if np is not None and isinstance(obj, np.ndarray):
+        if obj.ndim != 2 or obj.size == 0 or obj.dtype.kind not in "iuf":
+            return None
+        if obj.dtype.kind == "f":
+            return obj.astype("<f8").ravel(), obj.shape[1]
+        if obj.min() >= INT32_MIN and obj.max() <= INT32_MAX:
+            return obj.astype("<i4").ravel(), obj.shape[1]
+        if obj.max() <= INT64_MAX:
+            return obj.astype("<i8").ravel(), obj.shape[1]
+        return None
+
+    if not isinstance(obj, POINT_TYPES) or not obj:
+        return None
     sample = next(iter(obj))
-    return isinstance(sample, tuple) and all(isinstance(x, (int, float)) for x in sample)
+    if not isinstance(sample, tuple) or not sample:
+        return None
+    dim = len(sample)
+    if not all(isinstance(p, tuple) and len(p) == dim for p in obj):
+        return None
+
+    # array() rejects non-numbers and floats (TypeError) for "i" and "q",
+    # and out-of-range ints (OverflowError) for all typecodes
+    flat = list(chain.from_iterable(obj))
+    for typecode in ("i", "q"):
+        try:
+            return array(typecode, flat), dim
+        except OverflowError:
+            continue
+        except TypeError:
+            break
+    else:
+        return None
+
+    try:
+        values = array("d", flat)
+    except (TypeError, OverflowError):
+        return None
+    if min(values) < -FLOAT64_EXACT or max(values) > FLOAT64_EXACT:
+        if any(isinstance(x, int) and abs(x) > FLOAT64_EXACT for x in flat):
+            return None
+    return values, dim
+
+
+def is_point_collection(obj: Any) -> bool:
+    """Check if obj is a set/list of equal-length numeric tuples."""
+    return flatten_points(obj) is not None
 
 
 def is_graph(obj: Any) -> bool:
-    """Check if obj is a dict with list values (adjacency list)."""
+    """Check if obj is a dict with lists of hashable nodes as values (adjacency list)."""
     if not isinstance(obj, dict) or not obj:
         return False
     for value in obj.values():
         if not isinstance(value, list):
             return False
+        try:
+            hash(tuple(value))
+        except TypeError:
+            return False
     return True
 
 
@@ -52,16 +143,101 @@ def serialize_grid(grid: dict[tuple[int, int], Any]) -> dict:
     }
 
 
-def serialize_points(points: set | list) -> dict:
-    """Serialize a point collection."""
+DTYPES = {"i": "int32", "q": "int64", "d": "float64"}
+
+
+def encode_array(values: Any) -> dict:
+    """Encode a typed array from flatten_points as little-endian base64."""
+    if isinstance(values, array):
+        dtype = DTYPES[values.typecode]
+        if sys.byteorder == "big":
+            values = array(values.typecode, values)
+            values.byteswap()
+    else:
+        dtype = f"int{values.dtype.itemsize * 8}" if values.dtype.kind == "i" else "float64"
+    return {"dtype": dtype, "data": base64.b64encode(values.tobytes()).decode("ascii")}
+
+
+def pack_points(values: Any, dim: int) -> dict:
+    """Serialize flattened points as a packed typed array with bounds."""
+    if isinstance(values, array):
+        mins = [min(values[d::dim]) for d in range(dim)]
+        maxs = [max(values[d::dim]) for d in range(dim)]
+    else:
+        rows = values.reshape(-1, dim)
+        mins = rows.min(axis=0).tolist()
+        maxs = rows.max(axis=0).tolist()
+
+    return {
+        "type": "points",
+        "encoding": "packed",
+        "dim": dim,
+        "count": len(values) // dim,
+        **encode_array(values),
+        "bounds": {"min": mins, "max": maxs},
+    }
+
+
+def empty_points(dim: int = 2) -> dict:
+    """Serialize an empty point set as a packed frame with no points."""
+    return {
+        "type": "points",
+        "encoding": "packed",
+        "dim": dim,
+        "count": 0,
+        "dtype": "int32",
+        "data": "",
+        "bounds": None,
+    }
+
+
+def serialize_points(points: Any) -> dict:
+    """Serialize a point collection as a packed typed array.
+
+    Frame format:
+        {
+            "type": "points",
+            "encoding": "packed",
+            "dim": int,
+            "count": int,
+            "dtype": "int32" | "int64" | "float64",
+            "data": str,    # base64, little-endian, point-major
+            "bounds": {"min": [...], "max": [...]},  # per dimension, None if empty
+        }
+    """
+    flat = flatten_points(points)
+    if flat is None:
+        raise ValueError("Not a point collection")
+    return pack_points(*flat)
+
+
+def serialize_unpacked_points(points: set | frozenset | list) -> dict:
+    """Serialize points that cannot be packed as a list of lists.
+
+    Used for mixed dimensions or integers beyond int64, which have no typed
+    array representation but are still exact in JSON.
+    """
     return {
         "type": "points",
         "data": [list(p) for p in points],
     }
 
 
-def serialize_graph(graph: dict) -> dict:
-    """Serialize an adjacency list graph."""
+def is_unpacked_points(obj: Any) -> bool:
+    """Check if obj is a non-empty set/list of numeric tuples."""
+    if not isinstance(obj, POINT_TYPES) or not obj:
+        return False
+    return all(
+        isinstance(p, tuple) and p and all(isinstance(x, (int, float)) for x in p)
+        for p in obj
+    )
+
+
+def serialize_graph(graph: dict, node_state: dict[str, dict | set] | None = None) -> dict:
+    """Serialize an adjacency list graph.
+
+    Node state, if given, is included as {name: [[node, value], ...]}.
+    """
     nodes = set(graph.keys())
     for neighbors in graph.values():
         nodes.update(neighbors)
@@ -71,19 +247,291 @@ def serialize_graph(graph: dict) -> dict:
         for neighbor in neighbors:
             edges.append([node, neighbor])
 
-    return {
+    serialized = {
         "type": "graph",
         "nodes": list(nodes),
         "edges": edges,
     }
+    if node_state is not None:
+        serialized["state"] = {
+            name: (
+                [[node, value] for node, value in values.items()]
+                if isinstance(values, dict)
+                else [[node, True] for node in values]
+            )
+            for name, values in node_state.items()
+        }
+    return serialized
+
+
+def to_json_value(value: Any) -> Any:
+    """Convert tuples (recursively) to lists so values round-trip through JSON."""
+    if isinstance(value, tuple):
+        return [to_json_value(v) for v in value]
+    return value
+
+
+class GraphEncoder:
+    """Encodes successive snapshots of one graph as deltas.
+
+    Nodes are interned to integer IDs. The ID table is sent once and extended
+    as new nodes appear; after that each frame carries only added/removed
+    nodes and edges, and per-node state changes.
+
+    Frame format:
+        {
+            "type": "graph",
+            "encoding": "delta",
+            "keyframe": bool,          # True: discard any previous state
+            "intern": [node, ...],     # new nodes, IDs continue the table
+            "nodes_added": [id, ...],  # previously interned nodes reappearing
+            "nodes_removed": [id, ...],
+            "edges_added": [a0, b0, a1, b1, ...],
+            "edges_removed": [a0, b0, ...],
+            "state": {name: {"set": [[id, value], ...], "unset": [id, ...]}},
+            "base": int,               # non-keyframes: iteration it builds on
+        }
+
+    Newly interned nodes are implicitly present. "base" is added by
+    SnapshotSerializer.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all previous frames, so the next frame is a keyframe."""
+        self.ids: dict[Any, int] = {}
+        self.nodes: set[int] = set()
+        self.edges: set[tuple[int, int]] = set()
+        self.state: dict[str, dict[int, Any]] = {}
+        self.keyframe = True
+
+    def _intern(self, node: Any, interned: list) -> int:
+        node_id = self.ids.get(node)
+        if node_id is None:
+            node_id = len(self.ids)
+            self.ids[node] = node_id
+            interned.append(to_json_value(node))
+        return node_id
+
+    def encode(self, graph: dict, node_state: dict[str, dict | set] | None = None) -> dict:
+        """Encode the graph as a delta against the previously encoded frame."""
+        interned: list = []
+        intern = self._intern
+
+        edges = set()
+        nodes = set()
+        for node, neighbors in graph.items():
+            a = intern(node, interned)
+            nodes.add(a)
+            for neighbor in neighbors:
+                b = intern(neighbor, interned)
+                nodes.add(b)
+                edges.add((a, b))
+
+        first_new = len(self.ids) - len(interned)
+        nodes_added = [n for n in nodes - self.nodes if n < first_new]
+        nodes_removed = list(self.nodes - nodes)
+        edges_added = [i for edge in edges - self.edges for i in edge]
+        edges_removed = [i for edge in self.edges - edges for i in edge]
+
+        # State is only tracked for nodes that are in the graph this frame.
+        ids = self.ids
+        state = {}
+        new_state = {}
+        for name, values in (node_state or {}).items():
+            if isinstance(values, dict):
+                items = ((ids.get(k), to_json_value(v)) for k, v in values.items())
+            else:
+                items = ((ids.get(k), True) for k in values)
+            current = {k: v for k, v in items if k in nodes}
+            previous = self.state.get(name, {})
+            changes = {
+                "set": [[k, v] for k, v in current.items() if k not in previous or previous[k] != v],
+                "unset": [k for k in previous if k not in current],
+            }
+            if changes["set"] or changes["unset"]:
+                state[name] = changes
+            new_state[name] = current
+        for name, previous in self.state.items():
+            if name not in new_state and previous:
+                state[name] = {"set": [], "unset": list(previous)}
+
+        frame = {
+            "type": "graph",
+            "encoding": "delta",
+            "keyframe": self.keyframe,
+            "intern": interned,
+            "nodes_added": nodes_added,
+            "nodes_removed": nodes_removed,
+            "edges_added": edges_added,
+            "edges_removed": edges_removed,
+            "state": state,
+        }
+
+        self.nodes = nodes
+        self.edges = edges
+        self.state = new_state
+        self.keyframe = False
+        return frame
 
 
 def serialize_value(value: Any) -> Any:
     """Auto-detect type and serialize appropriately."""
+    if isinstance(value, Graph):
+        return serialize_graph(value.adjacency, value.node_state)
     if is_grid(value):
         return serialize_grid(value)
-    if is_point_collection(value):
-        return serialize_points(value)
     if is_graph(value):
         return serialize_graph(value)
+    if isinstance(value, (set, frozenset)) and not value:
+        return empty_points()
+    flat = flatten_points(value)
+    if flat is not None:
+        return pack_points(*flat)
+    if is_unpacked_points(value):
+        return serialize_unpacked_points(value)
     return value
+
+
+class PointsEncoder:
+    """Encodes successive snapshots of one set of points as deltas.
+
+    Sets are sent as added/removed points against the previous frame,
+    falling back to a full packed frame (see serialize_points) whenever the
+    delta would be at least as large. Lists and arrays are always sent
+    packed, since their order matters.
+
+    Delta frame format:
+        {
+            "type": "points",
+            "encoding": "delta",
+            "dim": int,
+            "count": int,   # points in the set after applying the delta
+            "added": {"dtype": ..., "data": ...},
+            "removed": {"dtype": ..., "data": ...},
+            "base": int,    # iteration it builds on, added by SnapshotSerializer
+        }
+    """
+
+    def __init__(self) -> None:
+        self.points: frozenset | None = None
+        self.dim = 0
+
+    def reset(self) -> None:
+        """Forget the previous frame, so the next frame is sent packed."""
+        self.points = None
+
+    def encode(self, points: Any) -> dict | None:
+        """Encode points, or return None if they are not a point collection.
+
+        Only the added/removed points are flattened for a delta; the whole
+        collection is flattened only when a packed frame is sent.
+        """
+        is_set = isinstance(points, (set, frozenset))
+        if is_set and not points:
+            return self.encode_empty()
+
+        previous = self.points
+        if is_set and previous:
+            added = points - previous
+            removed = previous - points
+            if len(added) + len(removed) < len(points):
+                # Removed points were validated when they were added
+                flat_added = flatten_points(added) if added else (array("i"), self.dim)
+                if flat_added is not None and flat_added[1] == self.dim:
+                    self.points = frozenset(points)
+                    return {
+                        "type": "points",
+                        "encoding": "delta",
+                        "dim": self.dim,
+                        "count": len(points),
+                        "added": encode_array(flat_added[0]),
+                        "removed": self._encode_set(removed),
+                    }
+
+        flat = flatten_points(points)
+        if flat is None:
+            self.points = None
+            return None
+        values, self.dim = flat
+        self.points = frozenset(points) if is_set else None
+        return pack_points(values, self.dim)
+
+    def encode_empty(self) -> dict:
+        """Encode an empty set, e.g. once every particle has been removed."""
+        self.points = frozenset()
+        return empty_points(self.dim or 2)
+
+    def _encode_set(self, points: set) -> dict:
+        if not points:
+            return {"dtype": "int32", "data": ""}
+        values, _ = flatten_points(points)
+        return encode_array(values)
+
+
+class SnapshotSerializer:
+    """Serializes snapshots, keeping per-key state so graphs and point sets
+    are sent as deltas.
+
+    One instance is used per run; keys are the snapshot keyword names. Each
+    delta records the iteration it builds on as "base", so a receiver that
+    missed an event can tell. All values are sent in full every
+    keyframe_interval iterations, and on the next snapshot after
+    request_keyframe().
+    """
+
+    def __init__(self, keyframe_interval: int = KEYFRAME_INTERVAL) -> None:
+        self.keyframe_interval = keyframe_interval
+        self._encoders: dict[str, GraphEncoder | PointsEncoder] = {}
+        self._last_iteration: dict[str, int] = {}
+        self._keyframe_requested = threading.Event()
+
+    def request_keyframe(self) -> None:
+        """Send every value in full on the next snapshot, e.g. after a lost event.
+
+        Safe to call from another thread, such as a recorder's sender.
+        """
+        self._keyframe_requested.set()
+
+    def serialize(self, state: dict[str, Any], iteration: int) -> dict[str, Any]:
+        """Serialize one snapshot's key-value pairs."""
+        # Clear only a request that was seen: one arriving after the check is
+        # kept for the next snapshot, one arriving before the clear is served
+        # by this keyframe
+        forced = self._keyframe_requested.is_set()
+        if forced:
+            self._keyframe_requested.clear()
+        if forced or iteration % self.keyframe_interval == 0:
+            for encoder in self._encoders.values():
+                encoder.reset()
+
+        serialized = {key: self.serialize_value(key, value) for key, value in state.items()}
+
+        for key, value in serialized.items():
+            if key not in self._encoders:
+                continue
+            if value.get("encoding") == "delta" and not value.get("keyframe"):
+                value["base"] = self._last_iteration[key]
+            self._last_iteration[key] = iteration
+        return serialized
+
+    def serialize_value(self, key: str, value: Any) -> Any:
+        """Serialize a single value, delta-encoding against the last frame."""
+        if isinstance(value, Graph):
+            return self._encoder(key, GraphEncoder).encode(value.adjacency, value.node_state)
+        if is_graph(value) and not is_grid(value):
+            return self._encoder(key, GraphEncoder).encode(value)
+        if isinstance(value, POINT_TYPES) or (np is not None and isinstance(value, np.ndarray)):
+            frame = self._encoder(key, PointsEncoder).encode(value)
+            if frame is not None:
+                return frame
+        self._encoders.pop(key, None)
+        return serialize_value(value)
+
+    def _encoder(self, key: str, cls: type) -> Any:
+        encoder = self._encoders.get(key)
+        if not isinstance(encoder, cls):
+            encoder = self._encoders[key] = cls()
+        return encoder